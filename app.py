@@ -1,9 +1,16 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
 import json
+import threading
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import firebase_admin
 from firebase_admin import credentials, auth, firestore
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from buckets import assign_to_parts, estimate_entry_size, get_bucket_id
+from search_tokens import SEARCH_TOKEN_LENGTH, get_search_tokens
 
 # --- Firebase Initialization and Authentication ---
 # These global variables are provided by the Canvas environment
@@ -11,12 +18,22 @@ app_id = typeof __app_id !== 'undefined' ? __app_id : 'default-app-id'
 firebase_config = json.loads(typeof __firebase_config !== 'undefined' ? __firebase_config : '{}')
 initial_auth_token = typeof __initial_auth_token !== 'undefined' ? __initial_auth_token : None
 
-# Initialize Firebase only once
-if not firebase_admin._apps:
+def warm_up_connection(db):
+    """Forces the Firestore client to establish its connection with a minimal read."""
+    try:
+        db.collection("_warm").limit(1).get()
+    except Exception:
+        pass # Only a warm-up; real requests report their own errors
+
+@st.cache_resource
+def bootstrap():
+    """Initializes Firebase and returns the Firestore client, once per process."""
     try:
         # Use a placeholder credential if running outside Canvas for local testing
         # In Canvas, firebase_config will be populated.
-        if firebase_config:
+        if firebase_admin._apps:
+            pass # Already initialized, e.g. after the resource cache was cleared
+        elif firebase_config:
             cred = credentials.Certificate(firebase_config)
             firebase_admin.initialize_app(cred)
         else:
@@ -28,116 +45,344 @@ if not firebase_admin._apps:
             # firebase_admin.initialize_app(cred)
     except Exception as e:
         st.error(f"Error initializing Firebase: {e}")
-        st.stop() # Stop the app if Firebase init fails
+        st.stop() # Stop the app if Firebase init fails; nothing is cached, so the next run retries
 
-db = firestore.client()
+    # firebase_admin hands back a plain google.cloud.firestore.Client, so reads already go
+    # straight to the Firestore client with no extra wrapper layer
+    db = firestore.client()
+    # The client opens its gRPC channel lazily on the first request. Issue a throwaway read in
+    # the background so the connection handshake overlaps with sign-in and building the UI.
+    threading.Thread(target=warm_up_connection, args=(db,), daemon=True).start()
+    return db
+
+db_client = bootstrap()
 
 # --- User Authentication (using session_state to persist across reruns) ---
+# Each browser session signs in once and keeps its own user id
 if 'user_id' not in st.session_state:
-    st.session_state.user_id = None
-    st.session_state.auth_ready = False
-
-@st.cache_resource
-def get_firebase_auth_and_db():
-    """Caches Firebase auth and db instances."""
-    return auth, db
-
-auth_client, db_client = get_firebase_auth_and_db()
-
-# Authenticate user only once
-if not st.session_state.auth_ready:
     try:
         if initial_auth_token:
-            user = auth_client.sign_in_with_custom_token(initial_auth_token)
-            st.session_state.user_id = user['uid']
-            st.session_state.auth_ready = True
-            st.success(f"Authenticated as user: {st.session_state.user_id}")
+            user = auth.sign_in_with_custom_token(initial_auth_token)
         else:
             # Sign in anonymously if no custom token is provided (e.g., local testing)
-            user = auth_client.sign_in_anonymously()
-            st.session_state.user_id = user['uid']
-            st.session_state.auth_ready = True
-            st.warning(f"Signed in anonymously as: {st.session_state.user_id}")
+            user = auth.sign_in_anonymously()
+        st.session_state.user_id = user['uid']
     except Exception as e:
-        st.error(f"Authentication failed: {e}")
-        st.session_state.auth_ready = True # Mark as ready to avoid infinite loop on failure
-        st.session_state.user_id = "anonymous_unauthenticated" # Fallback ID
+        st.error(f"Authentication failed: {e}. Please try refreshing the page.")
+        st.stop() # Nothing is stored, so the next run retries
+
+user_id = st.session_state.user_id
 
 # --- Firestore Paths ---
-def get_spendings_collection_ref():
-    """Returns the Firestore collection reference for spendings."""
-    if st.session_state.user_id:
-        return db_client.collection(f"artifacts/{app_id}/users/{st.session_state.user_id}/spendings")
-    return None
-
-def get_categories_collection_ref():
-    """Returns the Firestore collection reference for categories."""
-    if st.session_state.user_id:
-        return db_client.collection(f"artifacts/{app_id}/users/{st.session_state.user_id}/categories")
-    return None
+@st.cache_resource
+def get_refs(user_id):
+    """Returns the spending buckets collection and the categories and category totals document
+    references for a user.
+
+    Cached per user so the references aren't rebuilt on every rerun.
+    """
+    if not user_id:
+        return None, None, None
+    user_ref = db_client.document(f"artifacts/{app_id}/users/{user_id}")
+    meta_ref = user_ref.collection("meta")
+    return user_ref.collection("spending_months"), meta_ref.document("categories"), meta_ref.document("category_totals")
+
+def get_legacy_categories_collection_ref(user_id):
+    """Returns the old one-document-per-category collection, read only as a fallback."""
+    return db_client.collection(f"artifacts/{app_id}/users/{user_id}/categories")
+
+def get_legacy_spendings_collection_ref(user_id):
+    """Returns the old one-document-per-spending collection, read only to migrate it."""
+    return db_client.collection(f"artifacts/{app_id}/users/{user_id}/spendings")
+
+# --- Spending Buckets ---
+def get_bucket_reader(transaction, spendings_ref, month):
+    """Returns a get_bucket(part) function for assign_to_parts that reads within a transaction."""
+    def get_bucket(part):
+        bucket = spendings_ref.document(get_bucket_id(month, part)).get(transaction=transaction)
+        return bucket.to_dict() if bucket.exists else None
+    return get_bucket
+
+@firestore.transactional
+def write_spending(transaction, user_id, entry, new_category_names=None):
+    """Appends a spending entry to its month's bucket and updates the category totals.
+
+    New category names, if any, are added in the same transaction.
+    """
+    spendings_ref, categories_doc_ref, totals_doc_ref = get_refs(user_id)
+    if new_category_names:
+        # Names are stored sorted so reads can use them as-is
+        categories_doc = categories_doc_ref.get(transaction=transaction)
+        existing_names = categories_doc.to_dict().get("names", []) if categories_doc.exists else []
+        category_names = sorted(set(existing_names) | set(new_category_names))
+    # Find the first bucket of the month that still has room (reads must precede writes)
+    month = entry["timestamp"].strftime("%Y-%m")
+    [(part, _)] = assign_to_parts([entry], get_bucket_reader(transaction, spendings_ref, month))
+    bucket_ref = spendings_ref.document(get_bucket_id(month, part))
+
+    if new_category_names:
+        transaction.set(categories_doc_ref, {"names": category_names}, merge=True)
+    transaction.set(bucket_ref, {
+        "entries": firestore.ArrayUnion([entry]),
+        "count": firestore.Increment(1),
+        "size": firestore.Increment(estimate_entry_size(entry)),
+        # The bucket's tokens are the union of its entries' tokens, so a search only reads
+        # buckets that contain a match (served by the automatic array index)
+        "search_tokens": firestore.ArrayUnion(get_search_tokens(entry["description"])),
+    }, merge=True)
+    transaction.set(totals_doc_ref, {
+        "totals": {entry["category"]: firestore.Increment(entry["amount"])},
+        "counts": {entry["category"]: firestore.Increment(1)},
+    }, merge=True)
+
+MIGRATION_CHUNK_SIZE = 200 # Legacy spendings moved per transaction, well under the 500-write limit
+
+@firestore.transactional
+def migrate_legacy_spendings_chunk(transaction, user_id):
+    """Moves up to MIGRATION_CHUNK_SIZE legacy spending documents into buckets.
+
+    The entries, the category totals and the deletion of the legacy documents are written
+    in one transaction, so a chunk is either fully migrated or not at all. Returns the
+    number of documents migrated.
+    """
+    spendings_ref, _, totals_doc_ref = get_refs(user_id)
+    legacy_docs = list(transaction.get(get_legacy_spendings_collection_ref(user_id).limit(MIGRATION_CHUNK_SIZE)))
+    if not legacy_docs:
+        return 0
+
+    entries_by_month = {}
+    for doc in legacy_docs:
+        spending = doc.to_dict()
+        entry = {
+            "id": doc.id,
+            "amount": float(spending.get("amount", 0)),
+            "description": spending.get("description", ""),
+            "category": spending.get("category", ""),
+            "timestamp": spending.get("timestamp") or doc.create_time,
+        }
+        entries_by_month.setdefault(entry["timestamp"].strftime("%Y-%m"), []).append(entry)
+
+    # Spread each month's entries over the parts that still have room (reads must precede writes)
+    bucket_writes = []
+    for month, entries in entries_by_month.items():
+        for part, part_entries in assign_to_parts(entries, get_bucket_reader(transaction, spendings_ref, month)):
+            bucket_writes.append((spendings_ref.document(get_bucket_id(month, part)), part_entries))
+
+    totals, counts = {}, {}
+    for bucket_ref, entries in bucket_writes:
+        search_tokens = {token for entry in entries for token in get_search_tokens(entry["description"])}
+        transaction.set(bucket_ref, {
+            "entries": firestore.ArrayUnion(entries),
+            "count": firestore.Increment(len(entries)),
+            "size": firestore.Increment(sum(estimate_entry_size(entry) for entry in entries)),
+            "search_tokens": firestore.ArrayUnion(list(search_tokens)),
+        }, merge=True)
+        for entry in entries:
+            totals[entry["category"]] = totals.get(entry["category"], 0) + entry["amount"]
+            counts[entry["category"]] = counts.get(entry["category"], 0) + 1
+    transaction.set(totals_doc_ref, {
+        "totals": {category: firestore.Increment(total) for category, total in totals.items()},
+        "counts": {category: firestore.Increment(count) for category, count in counts.items()},
+    }, merge=True)
+    for doc in legacy_docs:
+        transaction.delete(doc.reference)
+    return len(legacy_docs)
+
+@st.cache_resource
+def migrate_legacy_spendings(user_id):
+    """Moves all of a user's legacy spending documents into buckets, once per process.
+
+    Migrated documents are deleted, so this is a single empty read for users with nothing
+    left to migrate. Raises on failure, which leaves it uncached and retried on the next run.
+    """
+    migrated = 0
+    while True:
+        count = migrate_legacy_spendings_chunk(db_client.transaction(), user_id)
+        if not count:
+            break
+        migrated += count
+    if migrated:
+        # Invalidate fetches cached before the migration, e.g. after an earlier failed attempt
+        data_versions = get_data_versions()
+        key = (user_id, "spend_version")
+        data_versions[key] = data_versions.get(key, 0) + 1
 
 # --- Data Fetching Functions ---
-@st.cache_data(ttl=60) # Cache data for 60 seconds
-def fetch_spendings(_user_id, _timestamp): # _timestamp is dummy for cache invalidation
-    """Fetches all spending records for the current user."""
-    spendings_ref = get_spendings_collection_ref()
+# The fetches raise on errors rather than returning an empty result, so a failure is never
+# cached; callers report it. Entries don't expire, so the cache size is bounded instead
+# (keys include every page cursor and search text).
+FETCH_CACHE_MAX_ENTRIES = 500
+SPENDINGS_PAGE_SIZE = 1 # Number of bucket documents (roughly months) fetched per page
+
+@st.cache_data(ttl=None, max_entries=FETCH_CACHE_MAX_ENTRIES, show_spinner=False) # Cached until the data version changes
+def fetch_spendings(user_id, version, page_size=SPENDINGS_PAGE_SIZE, cursor=None, search=""): # version is bumped on every spending write
+    """Fetches one page of spending bucket documents for the current user.
+
+    If search is given, only buckets indexed with its first trigram are read, and only
+    entries whose description contains it are returned.
+
+    Returns a (DataFrame, cursor) tuple. Pass the cursor back in to fetch the next page;
+    it is None once the last page has been reached.
+    """
+    spendings_ref, _, _ = get_refs(user_id)
     if not spendings_ref:
+        return pd.DataFrame(), None # Return empty if user not authenticated
+    # Bucket ids sort chronologically, so newest buckets come first.
+    # Only the entries are requested, not the bucket's bookkeeping fields.
+    query = (
+        spendings_ref.order_by(firestore.FieldPath.document_id(), direction=firestore.Query.DESCENDING)
+        .select(["entries"])
+        .limit(page_size)
+    )
+    search = search.strip().lower()
+    if len(search) >= SEARCH_TOKEN_LENGTH:
+        query = query.where("search_tokens", "array_contains", search[:SEARCH_TOKEN_LENGTH])
+    if cursor:
+        query = query.start_after(cursor)
+    # Collect each field into its own column list and build the DataFrame in one go.
+    # stream() yields snapshots as they arrive instead of materializing a list first.
+    ids, amounts, descriptions, categories, timestamps = [], [], [], [], []
+    bucket_ids = []
+    for doc in query.stream():
+        bucket_ids.append(doc.id)
+        for spending in doc.to_dict().get("entries", []):
+            if search and search not in spending.get('description', '').lower():
+                continue
+            ids.append(spending.get('id'))
+            amounts.append(spending.get('amount'))
+            descriptions.append(spending.get('description'))
+            categories.append(spending.get('category'))
+            timestamps.append(spending.get('timestamp'))
+    # Keep the cursor as plain field values (not a DocumentSnapshot) so the result stays cacheable
+    next_cursor = {"__name__": bucket_ids[-1]} if len(bucket_ids) == page_size else None
+    df = pd.DataFrame({
+        "id": ids,
+        "amount": amounts,
+        "description": descriptions,
+        "category": categories,
+        # Firestore returns datetime subclasses, converted here in a single vectorized call
+        "timestamp": pd.to_datetime(timestamps, utc=True),
+    })
+    # Entries are stored oldest first within a bucket
+    df = df.sort_values("timestamp", ascending=False, ignore_index=True)
+    return df, next_cursor
+
+def get_buckets(user_id, bucket_ids):
+    """Fetches the given spending bucket documents, e.g. a set of months.
+
+    Uses a single batched read for all ids. Returns the bucket snapshots; missing ids are skipped.
+    """
+    spendings_ref, _, _ = get_refs(user_id)
+    if not spendings_ref or not bucket_ids:
+        return []
+    refs = [spendings_ref.document(bucket_id) for bucket_id in bucket_ids]
+    return [doc for doc in db_client.get_all(refs) if doc.exists]
+
+@st.cache_data(ttl=None, max_entries=FETCH_CACHE_MAX_ENTRIES) # Cached until the data version changes
+def fetch_category_totals(user_id, version): # version is bumped on every spending write
+    """Fetches the number of spendings and total amount per category.
+
+    The totals are kept up to date by write_spending, so this is a single document read.
+    """
+    _, _, totals_doc_ref = get_refs(user_id)
+    if not totals_doc_ref:
         return pd.DataFrame() # Return empty if user not authenticated
-    try:
-        docs = spendings_ref.order_by("timestamp", direction=firestore.Query.DESCENDING).get()
-        data = []
-        for doc in docs:
-            spending = doc.to_dict()
-            spending['id'] = doc.id
-            # Convert Firestore Timestamp to datetime object for better display
-            if 'timestamp' in spending and isinstance(spending['timestamp'], firestore.Timestamp):
-                spending['timestamp'] = spending['timestamp'].to_datetime()
-            data.append(spending)
-        return pd.DataFrame(data)
-    except Exception as e:
-        st.error(f"Error fetching spendings: {e}")
+    doc = totals_doc_ref.get()
+    if not doc.exists:
         return pd.DataFrame()
-
-@st.cache_data(ttl=60) # Cache data for 60 seconds
-def fetch_categories(_user_id, _timestamp): # _timestamp is dummy for cache invalidation
+    data = doc.to_dict()
+    counts = data.get("counts", {})
+    totals = data.get("totals", {})
+    names = sorted(counts)
+    return pd.DataFrame({
+        "category": names,
+        "count": [counts[name] for name in names],
+        "total": [totals.get(name, 0) for name in names],
+    })
+
+@st.cache_data(ttl=None, max_entries=FETCH_CACHE_MAX_ENTRIES, show_spinner=False) # Cached until the data version changes
+def fetch_categories(user_id, version): # version is bumped when a category is added
     """Fetches all categories for the current user."""
-    categories_ref = get_categories_collection_ref()
-    if not categories_ref:
+    _, categories_doc_ref, _ = get_refs(user_id)
+    if not categories_doc_ref:
         return [] # Return empty if user not authenticated
-    try:
-        docs = categories_ref.get()
-        categories = [doc.to_dict()['name'] for doc in docs]
-        return sorted(categories)
-    except Exception as e:
-        st.error(f"Error fetching categories: {e}")
-        return []
+    # All category names live in a single document: one read regardless of count
+    doc = categories_doc_ref.get()
+    if doc.exists:
+        return doc.to_dict().get("names", []) # Kept sorted by write_spending
+    # Fall back to the old per-category documents for users created before the change
+    docs = get_legacy_categories_collection_ref(user_id).order_by("name").select(["name"]).stream()
+    return [doc.to_dict()['name'] for doc in docs]
+
+MAX_DESCRIPTION_LENGTH = 200 # Keeps spending entries small, so a bucket holds many of them
+
+@lru_cache(maxsize=256)
+def normalize_category_name(name):
+    """Normalizes a user-entered category name, e.g. '  coffee shop ' -> 'Coffee Shop'."""
+    return name.strip().title()
 
 # --- Streamlit UI ---
 st.set_page_config(layout="centered", page_title="Personal Spending Tracker")
 
 st.title("💸 Personal Spending Tracker")
 
-if not st.session_state.auth_ready:
-    st.info("Initializing application and authenticating...")
-    st.stop() # Stop until authentication is complete
+st.write(f"Logged in as: `{user_id}`")
 
-if not st.session_state.user_id or st.session_state.user_id == "anonymous_unauthenticated":
-    st.error("Could not authenticate user. Please try refreshing the page.")
+# Data versions, one per kind of data, bumped after a successful write touching that data.
+# The cached fetches are keyed on them, so data is only re-read after it has actually changed:
+# spend_version covers spendings and their totals, cat_version the category names.
+# The counters are kept per user in a process-wide dict so that new sessions
+# (e.g. after a page reload) don't pick up stale cache entries.
+@st.cache_resource
+def get_data_versions():
+    """Returns the process-wide dict of data versions, keyed by (user id, version name)."""
+    return {}
+
+data_versions = get_data_versions()
+
+# Spendings used to be stored one document each; move any that are left into buckets
+# before anything is read, so they show up in the list and the totals.
+try:
+    migrate_legacy_spendings(user_id)
+except Exception as e:
+    st.error(f"Error migrating existing spendings: {e}")
+
+for version_name in ("spend_version", "cat_version"):
+    st.session_state[version_name] = data_versions.setdefault((user_id, version_name), 0)
+
+def bump_version(version_name):
+    """Invalidates the cached fetches keyed on the given data version."""
+    data_versions[(user_id, version_name)] += 1
+    st.session_state[version_name] = data_versions[(user_id, version_name)]
+
+# Fetch categories and the first page of spendings concurrently so their round-trips overlap.
+# The workers only run the cached Firestore reads: those show no spinner and raise instead of
+# calling st.error, so every page element is added here on the main thread, from .result().
+# The workers get this script's run context so st.cache_data finds its runtime.
+fetch_executor = ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx()))
+categories_future = fetch_executor.submit(fetch_categories, user_id, st.session_state.cat_version)
+spendings_future = None
+# The search box is rendered further down; its value is already in session state
+spendings_key = (st.session_state.spend_version, st.session_state.get('spendings_search', ''))
+if st.session_state.get('spendings_loaded_for') != spendings_key:
+    # Stays in flight while the form below is built
+    spendings_future = fetch_executor.submit(fetch_spendings, user_id, spendings_key[0], search=spendings_key[1])
+    spendings_future_key = spendings_key
+try:
+    categories = categories_future.result()
+except Exception as e:
+    st.error(f"Error fetching categories: {e}")
+    # The form can't be offered without the existing categories: a new-category write
+    # would otherwise store a names list missing them
+    fetch_executor.shutdown(wait=False)
     st.stop()
-
-st.write(f"Logged in as: `{st.session_state.user_id}`")
-
-# Force cache invalidation by updating a dummy timestamp in session state
-if 'last_update_time' not in st.session_state:
-    st.session_state.last_update_time = datetime.now()
-
-categories = fetch_categories(st.session_state.user_id, st.session_state.last_update_time)
+category_set = frozenset(categories) # For O(1) membership checks
 
 with st.form("spending_form", clear_on_submit=True):
     st.header("Add New Spending")
 
     amount = st.number_input("Amount", min_value=0.01, format="%.2f", step=0.01)
-    description = st.text_input("Description (e.g., Grocery bill, Coffee)")
+    description = st.text_input("Description (e.g., Grocery bill, Coffee)", max_chars=MAX_DESCRIPTION_LENGTH)
 
     # Category selection
     category_options = ["Select an existing category"] + categories + ["--- Create New Category ---"]
@@ -148,8 +393,8 @@ with st.form("spending_form", clear_on_submit=True):
         new_category_name = st.text_input("Enter New Category Name")
         if new_category_name:
             # Normalize new category name
-            new_category_name = new_category_name.strip().title()
-            if new_category_name in categories:
+            new_category_name = normalize_category_name(new_category_name)
+            if new_category_name in category_set:
                 st.warning(f"Category '{new_category_name}' already exists. Selecting it instead.")
                 selected_category_option = new_category_name
             else:
@@ -167,31 +412,32 @@ with st.form("spending_form", clear_on_submit=True):
         else:
             final_category = selected_category_option
             if selected_category_option == "--- Create New Category ---" and new_category_name:
-                final_category = new_category_name.strip().title()
+                final_category = normalize_category_name(new_category_name)
 
             try:
-                # Add new category to Firestore if it's truly new
-                if final_category not in categories:
-                    categories_ref = get_categories_collection_ref()
-                    if categories_ref:
-                        categories_ref.add({"name": final_category, "userId": st.session_state.user_id})
-                        st.session_state.last_update_time = datetime.now() # Invalidate cache for categories
-                        st.success(f"New category '{final_category}' created!")
-
-                # Add spending record
-                spendings_ref = get_spendings_collection_ref()
-                if spendings_ref:
-                    spendings_ref.add({
-                        "amount": float(amount),
-                        "description": description.strip(),
-                        "category": final_category,
-                        "timestamp": firestore.SERVER_TIMESTAMP, # Use server timestamp for consistency
-                        "userId": st.session_state.user_id
-                    })
-                    st.success("Spending added successfully!")
-                    st.session_state.last_update_time = datetime.now() # Invalidate cache for spendings
-                else:
-                    st.error("Firestore collection not ready. Please refresh.")
+                # The spending, the category totals and the new category (if any) are written
+                # in a single transaction, so they succeed or fail together.
+                # Array elements can't hold SERVER_TIMESTAMP, so the client's UTC time is used.
+                # The id keeps otherwise identical entries distinct under ArrayUnion.
+                entry = {
+                    "id": uuid.uuid4().hex,
+                    "amount": float(amount),
+                    "description": description.strip(),
+                    "category": final_category,
+                    "timestamp": datetime.now(timezone.utc),
+                }
+                is_new_category = final_category not in category_set
+                # Legacy categories are carried over so the first write doesn't hide them
+                new_category_names = categories + [final_category] if is_new_category else None
+                write_spending(db_client.transaction(), user_id, entry, new_category_names)
+
+                if is_new_category:
+                    st.success(f"New category '{final_category}' created!")
+                st.success("Spending added successfully!")
+                # Invalidate only the caches of the data that was written
+                bump_version("spend_version")
+                if is_new_category:
+                    bump_version("cat_version")
 
             except Exception as e:
                 st.error(f"Error adding spending: {e}")
@@ -200,17 +446,82 @@ st.markdown("---")
 
 st.header("Your Spendings")
 
-# Display spendings
-spendings_df = fetch_spendings(st.session_state.user_id, st.session_state.last_update_time)
+# Per-category summary, covering all spendings, not just loaded pages
+try:
+    totals_df = fetch_category_totals(user_id, st.session_state.spend_version)
+except Exception as e:
+    st.error(f"Error fetching category totals: {e}")
+    totals_df = pd.DataFrame()
+if not totals_df.empty:
+    st.subheader("Totals by Category")
+    totals_df = totals_df[['category', 'count', 'total']]
+    totals_df.columns = ['Category', 'Count', 'Total']
+    st.dataframe(totals_df, use_container_width=True, hide_index=True)
+
+search = st.text_input("Search", key="spendings_search", placeholder="Search descriptions")
+
+# Display spendings, one page at a time. Loaded pages are kept in session state and
+# reset whenever the data or the search changes.
+spendings_key = (st.session_state.spend_version, search)
+if st.session_state.get('spendings_loaded_for') != spendings_key:
+    try:
+        if spendings_future is not None and spendings_future_key == spendings_key:
+            first_page, cursor = spendings_future.result()
+        else:
+            # A spending was just added, so the prefetched page is out of date
+            first_page, cursor = fetch_spendings(user_id, st.session_state.spend_version, search=search)
+        st.session_state.spendings_pages = [first_page]
+        st.session_state.spendings_cursor = cursor
+        st.session_state.spendings_loaded_for = spendings_key
+    except Exception as e:
+        st.error(f"Error fetching spendings: {e}")
+        # Not marked as loaded, so the next rerun tries again
+        st.session_state.spendings_pages = []
+        st.session_state.spendings_cursor = None
+        st.session_state.spendings_loaded_for = None
+fetch_executor.shutdown()
+
+def load_more_spendings():
+    """Fetches the next page of spendings and appends it to the loaded pages."""
+    try:
+        page, cursor = fetch_spendings(
+            user_id,
+            st.session_state.spend_version,
+            cursor=st.session_state.spendings_cursor,
+            search=st.session_state.spendings_search,
+        )
+    except Exception as e:
+        st.error(f"Error fetching spendings: {e}") # The cursor is kept, so the button can be retried
+        return
+    st.session_state.spendings_pages.append(page)
+    st.session_state.spendings_cursor = cursor
+
+spendings_df = pd.concat(st.session_state.spendings_pages, ignore_index=True) if st.session_state.spendings_pages else pd.DataFrame()
 
 if not spendings_df.empty:
+    # Compact dtypes shrink the table sent to the browser: 4-byte amounts, and categories
+    # as integer codes into a small set of names. Applied after concat, which would turn
+    # categoricals with differing categories back into plain strings.
+    spendings_df["amount"] = spendings_df["amount"].astype("float32")
+    spendings_df["category"] = spendings_df["category"].astype("category")
     # Reorder columns for better display
     display_df = spendings_df[['timestamp', 'amount', 'category', 'description']]
     display_df.columns = ['Date/Time', 'Amount', 'Category', 'Description']
-    st.dataframe(display_df, use_container_width=True, hide_index=True)
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        hide_index=True,
+        # float32 values would otherwise show float noise, e.g. 12.34000015
+        column_config={"Amount": st.column_config.NumberColumn(format="%.2f")},
+    )
+elif search:
+    st.info("No matching spendings loaded.")
 else:
     st.info("No spendings recorded yet. Add some above!")
+# With a search, a page can have no matches while older pages still do
+if st.session_state.spendings_cursor is not None:
+    st.button("Load more", on_click=load_more_spendings)
 
 st.markdown("---")
 st.write("Data is stored in Firestore and can be easily exported for ML analysis.")
-st.write(f"Firestore Path: `artifacts/{app_id}/users/{st.session_state.user_id}/...`")
+st.write(f"Firestore Path: `artifacts/{app_id}/users/{user_id}/...`")
@@ -0,0 +1,56 @@
+# --- Spending Buckets ---
+# Spendings are grouped by month into bucket documents ("YYYY-MM") holding an "entries" array,
+# so a month of spendings costs one read. A full bucket rolls over to "YYYY-MM-part02", etc.
+# A bucket is full once it holds SPENDINGS_PER_BUCKET entries or its entries' estimated size
+# reaches MAX_BUCKET_BYTES, which leaves room for the search tokens under Firestore's 1 MiB limit.
+SPENDINGS_PER_BUCKET = 500
+MAX_BUCKET_BYTES = 768 * 1024
+
+def get_bucket_id(month, part):
+    """Returns the bucket document id for a month ("YYYY-MM") and part number."""
+    return month if part == 1 else f"{month}-part{part:02d}"
+
+def estimate_entry_size(entry):
+    """Estimates an entry's stored size in bytes, following Firestore's storage size rules.
+
+    Strings count as their UTF-8 length plus one byte, numbers and timestamps as 8 bytes.
+    """
+    size = 0
+    for name, value in entry.items():
+        size += len(name.encode("utf-8")) + 1
+        size += len(value.encode("utf-8")) + 1 if isinstance(value, str) else 8
+    return size
+
+def count_fitting_entries(bucket, entries):
+    """Returns how many of the entries, taken in order, still fit into a bucket.
+
+    bucket is the bucket's current data (with its "count" and "size"), or None if it doesn't
+    exist yet. An empty bucket always takes at least one entry.
+    """
+    count = bucket.get("count", 0) if bucket else 0
+    size = bucket.get("size", 0) if bucket else 0
+    fitting = 0
+    for entry in entries:
+        entry_size = estimate_entry_size(entry)
+        if count and (count >= SPENDINGS_PER_BUCKET or size + entry_size > MAX_BUCKET_BYTES):
+            break
+        count += 1
+        size += entry_size
+        fitting += 1
+    return fitting
+
+def assign_to_parts(entries, get_bucket):
+    """Spreads a month's entries over its bucket parts, filling the earliest parts first.
+
+    get_bucket(part) returns the current data of that part's bucket, or None if it doesn't
+    exist yet. Returns a list of (part, entries) pairs.
+    """
+    assignments = []
+    part = 1
+    while entries:
+        fitting = count_fitting_entries(get_bucket(part), entries)
+        if fitting:
+            assignments.append((part, entries[:fitting]))
+            entries = entries[fitting:]
+        part += 1
+    return assignments
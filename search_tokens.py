@@ -0,0 +1,13 @@
+# --- Description Search Tokens ---
+# Descriptions are indexed as their lowercase trigrams. A search reads only the buckets whose
+# tokens contain the query's first trigram, then matches the full query as a substring.
+SEARCH_TOKEN_LENGTH = 3
+
+def get_search_tokens(text):
+    """Returns all distinct lowercase trigrams of a text, used to search descriptions.
+
+    No trigram is dropped: a missing token would hide matching entries from searches.
+    The number of distinct trigrams is small in practice, even across a full bucket.
+    """
+    text = text.lower()
+    return sorted({text[i:i + SEARCH_TOKEN_LENGTH] for i in range(len(text) - SEARCH_TOKEN_LENGTH + 1)})
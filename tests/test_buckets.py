@@ -0,0 +1,61 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from buckets import MAX_BUCKET_BYTES, SPENDINGS_PER_BUCKET, assign_to_parts, estimate_entry_size, get_bucket_id
+
+
+def make_entries(count):
+    return [{"id": str(i), "amount": 1.0, "description": "Coffee", "category": "Food"} for i in range(count)]
+
+
+class GetBucketIdTest(unittest.TestCase):
+    def test_first_part_is_the_month(self):
+        self.assertEqual(get_bucket_id("2026-10", 1), "2026-10")
+
+    def test_later_parts_are_zero_padded(self):
+        self.assertEqual(get_bucket_id("2026-10", 2), "2026-10-part02")
+        # Padding keeps the parts in order when ids are sorted
+        self.assertLess(get_bucket_id("2026-10", 9), get_bucket_id("2026-10", 10))
+
+
+class AssignToPartsTest(unittest.TestCase):
+    def test_new_month_goes_to_first_part(self):
+        entries = make_entries(1)
+        self.assertEqual(assign_to_parts(entries, lambda part: None), [(1, entries)])
+
+    def test_full_first_part_rolls_over_to_part_two(self):
+        buckets = {1: {"count": SPENDINGS_PER_BUCKET}}
+        entries = make_entries(1)
+        self.assertEqual(assign_to_parts(entries, buckets.get), [(2, entries)])
+
+    def test_partly_full_bucket_is_filled_before_the_next_part(self):
+        buckets = {1: {"count": SPENDINGS_PER_BUCKET - 2}}
+        entries = make_entries(5)
+        self.assertEqual(assign_to_parts(entries, buckets.get), [(1, entries[:2]), (2, entries[2:])])
+
+    def test_full_parts_are_skipped(self):
+        buckets = {1: {"count": SPENDINGS_PER_BUCKET}, 2: {"count": SPENDINGS_PER_BUCKET}, 3: {"count": 10}}
+        entries = make_entries(3)
+        self.assertEqual(assign_to_parts(entries, buckets.get), [(3, entries)])
+
+    def test_bucket_near_the_size_limit_rolls_over(self):
+        entries = make_entries(1)
+        buckets = {1: {"count": 10, "size": MAX_BUCKET_BYTES - estimate_entry_size(entries[0]) + 1}}
+        self.assertEqual(assign_to_parts(entries, buckets.get), [(2, entries)])
+
+    def test_empty_bucket_takes_an_oversized_entry(self):
+        entries = [{"id": "1", "description": "x" * MAX_BUCKET_BYTES}]
+        self.assertEqual(assign_to_parts(entries, lambda part: None), [(1, entries)])
+
+
+class EstimateEntrySizeTest(unittest.TestCase):
+    def test_counts_field_names_strings_and_numbers(self):
+        # "id" + "ab" -> 3 + 3, "amount" + number -> 7 + 8
+        self.assertEqual(estimate_entry_size({"id": "ab", "amount": 1.5}), 21)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_tokens import SEARCH_TOKEN_LENGTH, get_search_tokens
+
+
+class GetSearchTokensTest(unittest.TestCase):
+    def test_tokens_are_distinct_lowercase_trigrams(self):
+        self.assertEqual(get_search_tokens("Coffee"), ["cof", "fee", "ffe", "off"])
+
+    def test_short_text_has_no_tokens(self):
+        self.assertEqual(get_search_tokens("ab"), [])
+
+    def test_long_description_is_findable_by_any_substring(self):
+        description = "Monthly groceries at the farmers market, including vegetables, fruit and bread"
+        self.assertGreater(len(description), 52)
+        tokens = set(get_search_tokens(description))
+        text = description.lower()
+        # A search matches a bucket on the query's first trigram, so every trigram must be indexed
+        for start in range(len(text) - SEARCH_TOKEN_LENGTH + 1):
+            self.assertIn(text[start:start + SEARCH_TOKEN_LENGTH], tokens)
+
+
+if __name__ == "__main__":
+    unittest.main()